@@ -3,24 +3,26 @@
 import struct
 import zlib
 
+_U32 = struct.Struct('>I')
+# Bit depth 8, color type 6 = RGBA, default compression/filter/interlace
+_IHDR_TAIL = b'\x08\x06\x00\x00\x00'
+
 def create_minimal_png(size, r, g, b):
     def write_chunk(chunk_type, data):
-        chunk_len = struct.pack('>I', len(data))
-        chunk_crc = struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff)
+        chunk_len = _U32.pack(len(data))
+        chunk_crc = _U32.pack(zlib.crc32(data, zlib.crc32(chunk_type)) & 0xffffffff)
         return chunk_len + chunk_type + data + chunk_crc
 
     signature = b'\x89PNG\r\n\x1a\n'
-    # Color type 6 = RGBA
-    ihdr_data = struct.pack('>IIBBBBB', size, size, 8, 6, 0, 0, 0)
+    ihdr_data = struct.pack('>II', size, size) + _IHDR_TAIL
     ihdr = write_chunk(b'IHDR', ihdr_data)
     
-    raw_data = b''
-    for y in range(size):
-        raw_data += b'\x00'
-        for x in range(size):
-            raw_data += bytes([r, g, b, 255])
+    # Each scanline is a filter byte (0 = None) followed by the pixels
+    row = b'\x00' + bytes((r, g, b, 255)) * size
+    raw_data = row * size
     
-    compressed = zlib.compress(raw_data, 9)
+    # Level 1 trades size for speed: the 256px PNG is ~1.8 KB vs ~0.7 KB at 9
+    compressed = zlib.compress(raw_data, 1)
     idat = write_chunk(b'IDAT', compressed)
     iend = write_chunk(b'IEND', b'')
     
@@ -34,20 +36,19 @@ png_data = []
 for size in sizes:
     png_data.append(create_minimal_png(size, r, g, b))
 
-# ICO header
-ico_header = struct.pack('<HHH', 0, 1, len(sizes))  # Reserved, Type (1=ico), Count
+# Header + entries, followed by the image data
+offset = 6 + 16 * len(sizes)
+ico_data = bytearray(offset + sum(len(data) for data in png_data))
 
-# Calculate offsets
-offset = 6 + 16 * len(sizes)  # Header + entries
-entries = b''
-image_data = b''
+# ICO header
+struct.pack_into('<HHH', ico_data, 0, 0, 1, len(sizes))  # Reserved, Type (1=ico), Count
 
 for i, size in enumerate(sizes):
     data = png_data[i]
     w = 0 if size >= 256 else size
     h = 0 if size >= 256 else size
     
-    entry = struct.pack('<BBBBHHII',
+    struct.pack_into('<BBBBHHII', ico_data, 6 + 16 * i,
         w,              # Width
         h,              # Height  
         0,              # Color palette
@@ -57,11 +58,10 @@ for i, size in enumerate(sizes):
         len(data),      # Size of image data
         offset          # Offset to image data
     )
-    entries += entry
-    image_data += data
+    ico_data[offset:offset + len(data)] = data
     offset += len(data)
 
 with open('icon.ico', 'wb') as f:
-    f.write(ico_header + entries + image_data)
+    f.write(ico_data)
 
 print("icon.ico created!")
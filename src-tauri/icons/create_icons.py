@@ -1,35 +1,47 @@
 #!/usr/bin/env python3
 import struct
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 
-def create_minimal_png(size, r, g, b):
-    """Create a solid-color RGBA PNG"""
-    def write_chunk(chunk_type, data):
-        chunk_len = struct.pack('>I', len(data))
-        chunk_crc = struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff)
-        return chunk_len + chunk_type + data + chunk_crc
-
-    signature = b'\x89PNG\r\n\x1a\n'
-    # Color type 6 = RGBA
-    ihdr_data = struct.pack('>IIBBBBB', size, size, 8, 6, 0, 0, 0)
-    ihdr = write_chunk(b'IHDR', ihdr_data)
-    
-    raw_data = b''
-    for y in range(size):
-        raw_data += b'\x00'
-        for x in range(size):
-            raw_data += bytes([r, g, b, 255])
-    
-    compressed = zlib.compress(raw_data, 9)
-    idat = write_chunk(b'IDAT', compressed)
-    iend = write_chunk(b'IEND', b'')
-    
-    return signature + ihdr + idat + iend
+_U32 = struct.Struct('>I')
+# Bit depth 8, color type 6 = RGBA, default compression/filter/interlace
+_IHDR_TAIL = b'\x08\x06\x00\x00\x00'
+
+def write_png_to(f, size, r, g, b):
+    """Write a solid-color RGBA PNG to a binary file"""
+    def write_chunk(chunk_type, data=b''):
+        f.write(_U32.pack(len(data)))
+        f.write(chunk_type)
+        f.write(data)
+        f.write(_U32.pack(zlib.crc32(data, zlib.crc32(chunk_type)) & 0xffffffff))
+
+    f.write(b'\x89PNG\r\n\x1a\n')
+    ihdr_data = struct.pack('>II', size, size) + _IHDR_TAIL
+    write_chunk(b'IHDR', ihdr_data)
+
+    # Each scanline is a filter byte (0 = None) followed by the pixels.
+    # Compress one scanline at a time so the raw raster is never built;
+    # only the (small) compressed output is held in memory.
+    row = b'\x00' + bytes((r, g, b, 255)) * size
+    # Level 1 trades size for speed: the 256px PNG is ~1.8 KB vs ~0.7 KB at 9
+    zobj = zlib.compressobj(1)
+    compressed = b''.join([zobj.compress(row) for _ in range(size)]) + zobj.flush()
+    write_chunk(b'IDAT', compressed)
+    write_chunk(b'IEND')
+
+def write_png(path, size, r, g, b):
+    with open(path, 'wb', buffering=1 << 20) as f:
+        write_png_to(f, size, r, g, b)
 
 r, g, b = 139, 92, 246
 
-for size, name in [(32, '32x32.png'), (128, '128x128.png'), (256, '128x128@2x.png')]:
-    with open(name, 'wb') as f:
-        f.write(create_minimal_png(size, r, g, b))
+# Encode and write the PNGs concurrently
+with ThreadPoolExecutor(max_workers=4) as executor:
+    futures = [
+        executor.submit(write_png, name, size, r, g, b)
+        for size, name in [(32, '32x32.png'), (128, '128x128.png'), (256, '128x128@2x.png')]
+    ]
+for future in futures:
+    future.result()
 
 print("Icons created!")
@@ -3,88 +3,90 @@
 Generate Tauri icons from favicon.svg
 
 Requirements:
-  pip install cairosvg pillow
+  pip install cairosvg
 
 Usage:
   python generate_icons.py
 """
 
+import functools
 import os
+import struct
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     import cairosvg
-    from PIL import Image
-    import io
-except ImportError:
-    print("Installing required packages...")
-    os.system("pip install cairosvg pillow")
-    import cairosvg
-    from PIL import Image
-    import io
+except ImportError as e:
+    sys.exit(f"Error: missing dependency '{e.name}'. Install with: pip install cairosvg")
 
 # Get the directory of this script
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SVG_PATH = os.path.join(SCRIPT_DIR, "..", "..", "public", "favicon.svg")
 
-def svg_to_png(svg_path, png_path, size):
-    """Convert SVG to PNG at specified size"""
-    cairosvg.svg2png(
-        url=svg_path,
-        write_to=png_path,
+_ICO_HEADER = struct.Struct('<HHH')
+_ICO_ENTRY = struct.Struct('<BBBBHHII')
+
+# Icon sizes for ICNS, mapped to the PNG element types they fill. Like
+# Pillow's ICNS writer, this skips the PNG-encoded 16x16 and 32x32 types
+# (icp4/icp5), which some Finder versions display as blank.
+_ICNS_TYPES = {
+    32: (b"ic11",),             # 16x16@2x
+    64: (b"ic12",),             # 32x32@2x
+    128: (b"ic07",),            # 128x128
+    256: (b"ic13", b"ic08"),    # 128x128@2x, 256x256
+    512: (b"ic14", b"ic09"),    # 256x256@2x, 512x512
+    1024: (b"ic10",),           # 512x512@2x
+}
+
+def render_png(svg_bytes, size):
+    """Render SVG source to PNG bytes at specified size"""
+    return cairosvg.svg2png(
+        bytestring=svg_bytes,
         output_width=size,
         output_height=size
     )
+
+def render_pngs(sizes):
+    """Render each unique size once, in parallel worker processes"""
+    # Read the SVG once rather than having every render re-open it
+    with open(SVG_PATH, 'rb') as f:
+        svg_bytes = f.read()
+    
+    unique_sizes = sorted(set(sizes))
+    max_workers = min(len(unique_sizes), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        renders = executor.map(functools.partial(render_png, svg_bytes), unique_sizes)
+        return dict(zip(unique_sizes, renders))
+
+def write_png(png_path, png_bytes, size):
+    """Write rendered PNG bytes to a file"""
+    with open(png_path, 'wb') as f:
+        f.write(png_bytes)
     print(f"Created: {png_path} ({size}x{size})")
 
-def create_icns(png_paths, icns_path):
-    """Create macOS ICNS file from PNGs using iconutil or sips"""
-    import subprocess
-    import tempfile
-    import shutil
-    
-    # Create iconset directory
-    iconset_dir = tempfile.mkdtemp(suffix=".iconset")
-    
-    try:
-        # Required icon sizes for ICNS
-        sizes = {
-            16: "icon_16x16.png",
-            32: "icon_16x16@2x.png",
-            32: "icon_32x32.png",
-            64: "icon_32x32@2x.png",
-            128: "icon_128x128.png",
-            256: "icon_128x128@2x.png",
-            256: "icon_256x256.png",
-            512: "icon_256x256@2x.png",
-            512: "icon_512x512.png",
-            1024: "icon_512x512@2x.png",
-        }
-        
-        # Generate all required sizes
-        for size, name in [(16, "icon_16x16.png"), (32, "icon_16x16@2x.png"),
-                           (32, "icon_32x32.png"), (64, "icon_32x32@2x.png"),
-                           (128, "icon_128x128.png"), (256, "icon_128x128@2x.png"),
-                           (256, "icon_256x256.png"), (512, "icon_256x256@2x.png"),
-                           (512, "icon_512x512.png"), (1024, "icon_512x512@2x.png")]:
-            out_path = os.path.join(iconset_dir, name)
-            cairosvg.svg2png(url=SVG_PATH, write_to=out_path, 
-                           output_width=size, output_height=size)
-        
-        # Run iconutil to create ICNS
-        result = subprocess.run(
-            ["iconutil", "-c", "icns", iconset_dir, "-o", icns_path],
-            capture_output=True, text=True
-        )
-        
-        if result.returncode == 0:
-            print(f"Created: {icns_path}")
-        else:
-            print(f"iconutil failed: {result.stderr}")
-            # Fallback: just copy the 256x256 PNG
-            shutil.copy(png_paths.get(256, png_paths.get(128)), icns_path)
-    finally:
-        shutil.rmtree(iconset_dir, ignore_errors=True)
+def create_icns(renders, icns_path):
+    """Create macOS ICNS file from rendered PNGs keyed by size"""
+    # ICNS file format
+    # Header: 'icns' magic + 4-byte big-endian file length
+    # Elements: 4-byte type + 4-byte length (including this header) + PNG data
+    
+    total_size = 8 + sum(
+        (8 + len(renders[size])) * len(icns_types)
+        for size, icns_types in _ICNS_TYPES.items()
+    )
+    
+    # Write the pieces straight into the file buffer instead of joining
+    # them into one large bytes object first
+    with open(icns_path, 'wb', buffering=1 << 20) as f:
+        f.write(struct.pack('>4sI', b'icns', total_size))
+        for size, icns_types in _ICNS_TYPES.items():
+            png_bytes = renders[size]
+            for icns_type in icns_types:
+                f.write(struct.pack('>4sI', icns_type, 8 + len(png_bytes)))
+                f.write(png_bytes)
+    
+    print(f"Created: {icns_path}")
 
 def create_ico(png_data_list, ico_path):
     """Create Windows ICO file from multiple PNG sizes"""
@@ -94,45 +96,32 @@ def create_ico(png_data_list, ico_path):
     # Image data
     
     num_images = len(png_data_list)
+    data_offset = _ICO_HEADER.size + _ICO_ENTRY.size * num_images
+    total_size = data_offset + sum(len(png_bytes) for png_bytes, _ in png_data_list)
     
-    # Calculate offsets
-    header_size = 6
-    directory_size = 16 * num_images
-    data_offset = header_size + directory_size
-    
-    ico_data = bytearray()
+    ico_data = bytearray(total_size)
     
-    # ICO header
-    ico_data.extend(b'\x00\x00')  # Reserved
-    ico_data.extend(b'\x01\x00')  # Type: 1 = ICO
-    ico_data.extend(num_images.to_bytes(2, 'little'))
+    # ICO header: reserved, type (1 = ICO), image count
+    _ICO_HEADER.pack_into(ico_data, 0, 0, 1, num_images)
     
-    # Directory entries
+    # Directory entries followed by the image data they point at
     current_offset = data_offset
-    directory_entries = []
-    
-    for png_bytes, size in png_data_list:
-        entry = bytearray()
-        # Width (0 means 256)
-        entry.append(size if size < 256 else 0)
-        # Height (0 means 256)
-        entry.append(size if size < 256 else 0)
-        entry.append(0)  # Color palette (0 for no palette)
-        entry.append(0)  # Reserved
-        entry.extend(b'\x01\x00')  # Color planes
-        entry.extend(b'\x20\x00')  # Bits per pixel (32)
-        entry.extend(len(png_bytes).to_bytes(4, 'little'))  # Size of image data
-        entry.extend(current_offset.to_bytes(4, 'little'))  # Offset to image data
-        
-        directory_entries.append(entry)
-        current_offset += len(png_bytes)
-    
-    for entry in directory_entries:
-        ico_data.extend(entry)
     
-    # Image data
-    for png_bytes, size in png_data_list:
-        ico_data.extend(png_bytes)
+    for i, (png_bytes, size) in enumerate(png_data_list):
+        dim = size if size < 256 else 0  # 0 means 256
+        _ICO_ENTRY.pack_into(
+            ico_data, _ICO_HEADER.size + i * _ICO_ENTRY.size,
+            dim,                # Width
+            dim,                # Height
+            0,                  # Color palette (0 for no palette)
+            0,                  # Reserved
+            1,                  # Color planes
+            32,                 # Bits per pixel
+            len(png_bytes),     # Size of image data
+            current_offset      # Offset to image data
+        )
+        ico_data[current_offset:current_offset + len(png_bytes)] = png_bytes
+        current_offset += len(png_bytes)
     
     with open(ico_path, 'wb') as f:
         f.write(ico_data)
@@ -147,27 +136,20 @@ def main():
     print(f"Converting: {SVG_PATH}")
     print("-" * 40)
     
-    # Generate PNG icons
+    # Render every size needed by any output exactly once
     sizes = [(32, "32x32.png"), (128, "128x128.png"), (256, "128x128@2x.png")]
-    png_paths = {}
+    ico_sizes = [16, 32, 48, 64, 128, 256]
+    renders = render_pngs([size for size, _ in sizes] + ico_sizes + list(_ICNS_TYPES))
     
     for size, name in sizes:
-        out_path = os.path.join(SCRIPT_DIR, name)
-        svg_to_png(SVG_PATH, out_path, size)
-        png_paths[size] = out_path
+        write_png(os.path.join(SCRIPT_DIR, name), renders[size], size)
     
     # Generate ICO for Windows
     print("-" * 40)
-    ico_sizes = [16, 32, 48, 64, 128, 256]
     png_data_list = []
     
     for size in ico_sizes:
-        png_bytes = cairosvg.svg2png(
-            url=SVG_PATH,
-            output_width=size,
-            output_height=size
-        )
-        png_data_list.append((png_bytes, size))
+        png_data_list.append((renders[size], size))
     
     ico_path = os.path.join(SCRIPT_DIR, "icon.ico")
     create_ico(png_data_list, ico_path)
@@ -175,7 +157,7 @@ def main():
     # Generate ICNS for macOS
     print("-" * 40)
     icns_path = os.path.join(SCRIPT_DIR, "icon.icns")
-    create_icns(png_paths, icns_path)
+    create_icns(renders, icns_path)
     
     print("-" * 40)
     print("✅ All icons generated successfully!")